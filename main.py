@@ -31,14 +31,26 @@ def run_cleanup():
 def run_command(command, description):
     print(f"\n=== {description} ===")
     try:
-        result = subprocess.run(command, check=True, capture_output=True, text=True)
-        print(result.stdout)
-        return True, result.stdout
-    except subprocess.CalledProcessError as e:
-        print(f"Error: {e}")
-        print(f"STDOUT: {e.stdout}")
-        print(f"STDERR: {e.stderr}")
-        return False, e.stdout
+        # Stream the child's output as it arrives instead of buffering
+        # everything in memory until the process exits
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1<<16,
+            text=True
+        )
+        output_lines = []
+        for line in process.stdout:
+            print(line, end='')
+            output_lines.append(line)
+        returncode = process.wait()
+        output = ''.join(output_lines)
+
+        if returncode != 0:
+            print(f"Error: command returned {returncode}")
+            return False, output
+        return True, output
     except Exception as e:
         print(f"Error: {e}")
         return False, str(e)
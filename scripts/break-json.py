@@ -1,23 +1,126 @@
 #!/usr/bin/env python3
 import argparse
+import concurrent.futures
+import gzip
 import json
 import os
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Items handed to each pool worker per task; bounds memory when streaming
+CHUNK_SIZE = 1024
+
+# Compiled once at import; clean_filename runs per item
+_CLEAN_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
 def clean_filename(name):
     # Convert to a safe filename by removing problematic characters
-    return re.sub(r'[^a-zA-Z0-9_-]', '_', str(name))
+    return _CLEAN_RE.sub('_', name if isinstance(name, str) else str(name))
+
+def open_input(input_file, buffering=1<<22):
+    """Open the input JSON, transparently decompressing .gz files."""
+    if input_file.endswith('.gz'):
+        return gzip.open(input_file, 'rb')
+    return open(input_file, 'rb', buffering=buffering)
+
+def item_filename(item, index):
+    """Generate a descriptive filename if possible, otherwise use index."""
+    if 'id' in item:
+        return f"{clean_filename(item['id'])}.txt"
+    if 'name' in item:
+        return f"{clean_filename(item['name'])}.txt"
+    if 'State' in item:
+        return f"{clean_filename(item['State'])}_{index}.txt"
+    return f"item_{index}.txt"
+
+def write_item_chunk(items_chunk, output_dir, start_index):
+    """Write one chunk of items to individual text files.
+
+    Runs in a worker process; start_index keeps the generated filenames
+    identical to the original single-loop numbering. Returns the number
+    of files written.
+    """
+    written = 0
+    for offset, item in enumerate(items_chunk):
+        i = start_index + offset
+        if not isinstance(item, dict):
+            print(f"Warning: Skipping non-dict item at index {i}")
+            continue
+
+        file_path = os.path.join(output_dir, item_filename(item, i))
 
-def break_json_to_files(input_file, output_dir):
-    # Read the input JSON file
-    with open(input_file, 'r') as f:
+        # Build the whole body first so each file is a single write()
+        # call instead of one small write per field
+        body = ''.join(f"{key}: {value}\n" for key, value in item.items())
+        with open(file_path, 'w', buffering=1<<20) as f:
+            f.write(body)
+        written += 1
+
+    return written
+
+def _iter_chunks_streaming(input_file):
+    """Yield (start_index, items) chunks lazily with ijson.
+
+    Never holds more than one chunk of parsed items in memory, so RSS
+    stays bounded however large the input document is. Bad input is
+    reported the same way _iter_chunks_loaded reports it.
+    """
+    with open_input(input_file) as f:
+        # Peek at the first byte to pick the right item prefix for the
+        # two supported layouts: {"haunted_places": [...]} or [...]
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+        prefix = 'haunted_places.item' if first == b'{' else 'item'
+
+        chunk = []
+        start = 0
         try:
-            data = json.load(f)
-        except json.JSONDecodeError as e:
+            for item in ijson.items(f, prefix):
+                chunk.append(item)
+                if len(chunk) >= CHUNK_SIZE:
+                    yield start, chunk
+                    start += len(chunk)
+                    chunk = []
+        except ijson.JSONError as e:
             print(f"Error: Invalid JSON in {input_file}")
             print(f"JSON error: {e}")
             return
-    
+        if chunk:
+            yield start, chunk
+
+    # A dict without the expected key streams zero items; tell that
+    # apart from a legitimately empty array before staying silent
+    if first == b'{' and start == 0 and not chunk:
+        with open_input(input_file) as f:
+            if next(ijson.items(f, 'haunted_places'), None) is None:
+                print(f"Error: Unexpected JSON format in {input_file}")
+                print(f"Expected a list or a dict with 'haunted_places' key")
+
+def _iter_chunks_loaded(input_file):
+    """Yield (start_index, items) chunks from a fully parsed document."""
+    # Read the input JSON file (orjson parses large documents much faster)
+    with open_input(input_file) as f:
+        try:
+            if orjson is not None:
+                data = orjson.loads(f.read())
+            else:
+                data = json.load(f)
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error: Invalid JSON in {input_file}")
+            print(f"JSON error: {e}")
+            return
+
     # Handle different JSON structures
     if isinstance(data, dict) and "haunted_places" in data:
         # Format: {"haunted_places": [...]}
@@ -30,50 +133,96 @@ def break_json_to_files(input_file, output_dir):
         print(f"Expected a list or a dict with 'haunted_places' key")
         print(f"Got: {type(data)}")
         return
-    
+
     if not isinstance(items, list):
         print(f"Error: Expected an array but got {type(items)}")
         return
-    
+
+    for start in range(0, len(items), CHUNK_SIZE):
+        yield start, items[start:start + CHUNK_SIZE]
+
+def write_shards(chunks, output_dir, num_shards):
+    """Write items as JSON-lines shards instead of one file per item.
+
+    Each record becomes one line {"id": <filename>, "body": <text>} in
+    shard_<i mod N>.jsonl, turning ~10k tiny file creates into N large
+    sequential appends. Returns the number of records written.
+    """
+    if orjson is not None:
+        encode = lambda rec: orjson.dumps(rec).decode('utf-8')
+    else:
+        encode = lambda rec: json.dumps(rec, separators=(',', ':'))
+
+    handles = [
+        open(os.path.join(output_dir, f"shard_{s:02d}.jsonl"), 'w', buffering=1<<22)
+        for s in range(num_shards)
+    ]
+    written = 0
+    try:
+        for start, chunk in chunks:
+            for offset, item in enumerate(chunk):
+                i = start + offset
+                if not isinstance(item, dict):
+                    print(f"Warning: Skipping non-dict item at index {i}")
+                    continue
+                record = {
+                    "id": item_filename(item, i),
+                    "body": ''.join(f"{key}: {value}\n" for key, value in item.items()),
+                }
+                handles[i % num_shards].write(encode(record) + "\n")
+                written += 1
+    finally:
+        for handle in handles:
+            handle.close()
+    return written
+
+def break_json_to_files(input_file, output_dir, shards=0):
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
-    
-    # Create a file for each JSON object
-    for i, item in enumerate(items):
-        # Generate a descriptive filename if possible, otherwise use index
-        if isinstance(item, dict):
-            if 'id' in item:
-                filename = f"{clean_filename(item['id'])}.txt"
-            elif 'name' in item:
-                filename = f"{clean_filename(item['name'])}.txt"
-            elif 'State' in item:
-                filename = f"{clean_filename(item['State'])}_{i}.txt"
-            else:
-                filename = f"item_{i}.txt"
-            
-            file_path = os.path.join(output_dir, filename)
-            
-            # Write each field as a line in the text file
-            with open(file_path, 'w') as f:
-                for key, value in item.items():
-                    f.write(f"{key}: {value}\n")
-        else:
-            print(f"Warning: Skipping non-dict item at index {i}")
-    
-    file_count = len([f for f in os.listdir(output_dir) if f.endswith('.txt')])
+
+    # Stream items lazily when ijson is installed; otherwise fall back
+    # to parsing the whole document up front
+    if ijson is not None:
+        chunks = _iter_chunks_streaming(input_file)
+    else:
+        chunks = _iter_chunks_loaded(input_file)
+
+    if shards:
+        file_count = write_shards(chunks, output_dir, shards)
+        print(f"Created {file_count} records across {shards} shards in {output_dir}")
+        return
+
+    # Writing the files is embarrassingly parallel, so fan the chunks
+    # out to a process pool, keeping only a small window of submitted
+    # chunks in flight so memory stays bounded
+    workers = os.cpu_count() or 1
+    file_count = 0
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for start, chunk in chunks:
+            pending.add(pool.submit(write_item_chunk, chunk, output_dir, start))
+            if len(pending) >= workers * 2:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                file_count += sum(future.result() for future in done)
+        file_count += sum(future.result() for future in pending)
+
     print(f"Created {file_count} files in {output_dir}")
 
 def main():
     parser = argparse.ArgumentParser(description="Break JSON array into individual files")
     parser.add_argument("--input", required=True, help="Input JSON file")
     parser.add_argument("--output-dir", required=True, help="Output directory for individual files")
+    parser.add_argument("--shards", type=int, default=0,
+                      help="Write N JSON-lines shard files instead of one text file "
+                           "per item (0 keeps the per-file layout)")
     args = parser.parse_args()
-    
+
     if not os.path.exists(args.input):
         print(f"Error: Input file not found: {args.input}")
         return 1
-        
-    break_json_to_files(args.input, args.output_dir)
+
+    break_json_to_files(args.input, args.output_dir, args.shards)
     return 0
 
 if __name__ == "__main__":
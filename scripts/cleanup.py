@@ -2,19 +2,19 @@ import shutil
 from pathlib import Path
 
 def delete_path(path):
-    if path.exists():
-        if path.is_file():
-            path.unlink()
-            print(f"Deleted file: {path}")
-        elif path.is_dir():
-            shutil.rmtree(path)
-            print(f"Deleted directory: {path}")
+    # Try the unlink first and fall back on the error instead of paying
+    # for exists/is_file/is_dir stat calls up front
+    try:
+        path.unlink()
+        print(f"Deleted file: {path}")
+    except FileNotFoundError:
+        pass
+    except (IsADirectoryError, PermissionError):
+        shutil.rmtree(path, ignore_errors=True)
+        print(f"Deleted directory: {path}")
 
 def main():
-    import shutil
-    from pathlib import Path
-
-    project_root = Path(__file__).parent.parent
+    project_root = Path(__file__).resolve().parent.parent
 
     paths_to_delete = [
         project_root / "datasets" / "merged_dataset.json",
@@ -25,15 +25,16 @@ def main():
     ]
 
     for path in paths_to_delete:
-        if path.exists():
-            if path.is_file():
-                path.unlink()
-                print(f"Deleted file: {path}")
-            elif path.is_dir():
-                shutil.rmtree(path)
-                print(f"Deleted directory: {path}")
-        else:
+        # Single unlink attempt instead of exists/is_file/is_dir, which
+        # each stat the path separately
+        try:
+            path.unlink()
+            print(f"Deleted file: {path}")
+        except FileNotFoundError:
             print(f"Path not found, skipping: {path}")
+        except (IsADirectoryError, PermissionError):
+            shutil.rmtree(path, ignore_errors=True)
+            print(f"Deleted directory: {path}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
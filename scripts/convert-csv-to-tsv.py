@@ -1,9 +1,17 @@
-import pandas as pd
+import csv
 import argparse
 
 def convert_csv_to_tsv(input_file, output_file):
-    df = pd.read_csv(input_file)
-    df.to_csv(output_file, sep='\t', index=False)
+    # Stream row by row instead of loading the whole file into a
+    # DataFrame, so memory stays constant for arbitrarily large inputs.
+    # utf-8-sig strips the BOM our CSVs carry (it would otherwise leak
+    # into the first header cell), and the explicit line terminator
+    # keeps the LF endings the pandas version produced
+    with open(input_file, 'r', encoding='utf-8-sig', newline='', buffering=1<<22) as f_in, \
+         open(output_file, 'w', encoding='utf-8', newline='', buffering=1<<22) as f_out:
+        reader = csv.reader(f_in)
+        writer = csv.writer(f_out, dialect=csv.excel_tab, lineterminator='\n')
+        writer.writerows(reader)
     print(f"Converted {input_file} to {output_file}")
 
 if __name__ == "__main__":
@@ -11,5 +19,5 @@ if __name__ == "__main__":
     parser.add_argument("--input", required=True, help="Input CSV file")
     parser.add_argument("--output", required=True, help="Output TSV file")
     args = parser.parse_args()
-    
+
     convert_csv_to_tsv(args.input, args.output)
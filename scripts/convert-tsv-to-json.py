@@ -1,101 +1,132 @@
 import sys
-import subprocess
 import csv
+import gzip
 import os
 import json
+import re
 import argparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Same unsafe-character pattern break-json.py uses for its filenames
+_CLEAN_RE = re.compile(r'[^a-zA-Z0-9_-]')
+
+def clean_filename(name):
+    return _CLEAN_RE.sub('_', name if isinstance(name, str) else str(name))
+
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description="Convert TSV to JSON")
     parser.add_argument("--input", required=True, help="Input TSV file")
     parser.add_argument("--output", required=True, help="Output JSON file")
-    parser.add_argument("--threshold", type=float, default=1.0, 
+    parser.add_argument("--threshold", type=float, default=1.0,
                       help="Similarity threshold (1.0 means keep everything)")
+    parser.add_argument("--split-dir", default=None,
+                      help="Also write one text file per row into this directory, "
+                           "fusing the break-json step into the conversion pass")
     args = parser.parse_args()
-    
+
     # Get the project root directory
     script_dir = os.path.dirname(os.path.abspath(__file__))
     project_root = os.path.dirname(script_dir)
     datasets_dir = os.path.join(project_root, 'datasets')
-    
+
     # Use the paths from command line arguments
     tsv_file = args.input
     json_file = args.output
     column_headers_file = os.path.join(datasets_dir, 'column_headers.txt')
-    object_type = 'haunted_places'
     threshold = args.threshold
-    
+
     print(f"Converting {tsv_file} to {json_file} with threshold {threshold}")
-    
+
     # Create the column_headers.txt file from the TSV headers
     create_column_headers_file(tsv_file, column_headers_file)
-    
-    command = [
-        'python3', os.path.join(project_root, 'etllib/etl/tsvtojson.py'),
-        '-t', tsv_file,
-        '-j', json_file,
-        '-c', column_headers_file,
-        '-o', object_type,
-        '-s', str(threshold)
-    ]
 
     try:
-        subprocess.run(command, check=True)
+        record_count = convert_tsv_to_json(tsv_file, json_file, args.split_dir)
         print(f"Successfully converted {tsv_file} to {json_file}")
-        
-        # Post-process the JSON to remove the header row
-        remove_header_row_from_json(json_file, object_type)
-        
-    except subprocess.CalledProcessError as e:
-        print(f"Error occurred while converting TSV to JSON: {e}", file=sys.stderr)
-        
-    # At the end of your main() function in convert-tsv-to-json.py, add:
-    try:
-        with open(json_file, 'r') as f:
-            data = json.load(f)
-            print(f"TOTAL RECORDS IN JSON: {len(data['haunted_places'])}")
+        if args.split_dir:
+            print(f"Wrote {record_count} per-row files to {args.split_dir}")
+        print(f"TOTAL RECORDS IN JSON: {record_count}")
     except Exception as e:
-        print(f"Error counting records: {e}")
+        print(f"Error occurred while converting TSV to JSON: {e}", file=sys.stderr)
+
+def row_filename(row, index):
+    """Per-row text filename, matching break-json.py's naming scheme."""
+    if 'id' in row:
+        return f"{clean_filename(row['id'])}.txt"
+    if 'name' in row:
+        return f"{clean_filename(row['name'])}.txt"
+    if 'State' in row:
+        return f"{clean_filename(row['State'])}_{index}.txt"
+    return f"item_{index}.txt"
+
+def convert_tsv_to_json(tsv_file, json_file, split_dir=None):
+    """Stream the TSV rows straight into the output JSON file.
+
+    The header row is consumed by DictReader for field names, so it never
+    appears as a data record. Rows are written one at a time instead of
+    building the full list in memory, and the output is compact (no
+    indentation) to keep the file small.
+
+    When split_dir is given, each row is also written out as an individual
+    text file in the same pass, so the break-json step does not have to
+    re-read and re-parse the JSON it would otherwise consume.
+    """
+    if orjson is not None:
+        encode = lambda row: orjson.dumps(row).decode('utf-8')
+    else:
+        encode = lambda row: json.dumps(row, separators=(',', ':'))
+
+    if split_dir:
+        os.makedirs(split_dir, exist_ok=True)
+
+    # A .gz output is compressed on the fly; level 1 costs little CPU
+    # and cuts the bytes hitting disk several-fold for JSON
+    if json_file.endswith('.gz'):
+        open_out = lambda: gzip.open(json_file, 'wt', encoding='utf-8', compresslevel=1)
+    else:
+        open_out = lambda: open(json_file, 'w', encoding='utf-8', buffering=1<<20)
+
+    record_count = 0
+    with open(tsv_file, 'r', encoding='utf-8', newline='') as f_in, \
+         open_out() as f_out:
+        reader = csv.DictReader(f_in, delimiter='\t')
+        f_out.write('{"haunted_places":[')
+        for row in reader:
+            if record_count:
+                f_out.write(',')
+            f_out.write(encode(row))
+
+            if split_dir:
+                file_path = os.path.join(split_dir, row_filename(row, record_count))
+                body = ''.join(f"{key}: {value}\n" for key, value in row.items())
+                with open(file_path, 'w', buffering=1<<20) as f:
+                    f.write(body)
+
+            record_count += 1
+        f_out.write(']}')
+
+    return record_count
 
 def create_column_headers_file(tsv_file, column_headers_file):
     """Create a column headers file from the TSV headers."""
     try:
-        # Try to read the first line of the TSV file to get the headers
+        # The header is just the first line; no need for a csv.reader
         with open(tsv_file, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f, delimiter='\t')
-            headers = next(reader)  # Get the first row which contains headers
-        
-        # Write the headers to the column_headers.txt file
+            headers = f.readline().rstrip('\r\n').split('\t')
+
+        # Write the headers to the column_headers.txt file in one write
         with open(column_headers_file, 'w', encoding='utf-8') as f:
-            for header in headers:
-                f.write(f"{header}\n")
-        
+            f.write('\n'.join(headers) + '\n')
+
         print(f"Created column headers file: {column_headers_file} with {len(headers)} headers")
     except Exception as e:
         print(f"Error creating column headers file: {e}", file=sys.stderr)
         sys.exit(1)
 
-def remove_header_row_from_json(json_file, object_type):
-    """Remove the first object (header row) from the JSON file."""
-    try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # Check if there's at least one object
-        if object_type in data and len(data[object_type]) > 0:
-            # Remove the first object (header row)
-            data[object_type] = data[object_type][1:]
-            
-            # Write back the modified JSON
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
-            
-            print(f"Removed header row from JSON. Remaining objects: {len(data[object_type])}")
-        else:
-            print("No objects found in JSON or empty array.")
-    except Exception as e:
-        print(f"Error removing header row from JSON: {e}", file=sys.stderr)
-
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
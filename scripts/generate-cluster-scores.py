@@ -1,50 +1,206 @@
 #!/usr/bin/env python3
+import argparse
+import concurrent.futures
 import csv
+import functools
+import heapq
+import logging
 import os
+import runpy
 import subprocess
 import sys
 import json
 import shutil
+from collections import Counter
 from pathlib import Path
 
-def convert_csv_to_similarity_scores(csv_file, output_file):
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Per-file diagnostics are debug-level; enable with LOG_LEVEL=DEBUG
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "WARNING"))
+
+def _convert_with_polars(csv_file, output_file, min_score=0.0, top_k=None):
+    """Vectorized version of convert_csv_to_similarity_scores using polars.
+
+    The native multi-threaded CSV parser plus columnar filter, sort and
+    string ops keep the whole conversion out of the Python interpreter.
+    """
+    df = pl.read_csv(csv_file, has_header=True,
+                     new_columns=['a', 'b', 's'], comment_prefix='#',
+                     schema_overrides={'s': pl.Float64})
+
+    if min_score > 0.0:
+        df = df.filter(pl.col('s') >= min_score)
+    if top_k is not None:
+        df = df.top_k(top_k, by='s')
+
+    # Interleave file1/file2 entries per pair like the row loop, then
+    # stable-sort by descending score
+    a = df.select(pl.col('a').alias('path'), pl.col('s').alias('score'))
+    b = df.select(pl.col('b').alias('path'), pl.col('s').alias('score'))
+    doubled = (
+        pl.concat([a.with_row_index(), b.with_row_index()])
+        .sort('index', maintain_order=True)
+        .drop('index')
+        # Symmetric CSVs repeat the same (path, score) pair across many
+        # counterparts; keep only the first occurrence
+        .with_columns(pl.col('score').round(4).alias('key'))
+        .unique(subset=['path', 'key'], keep='first', maintain_order=True)
+        .drop('key')
+        .sort('score', descending=True, maintain_order=True)
+        .with_columns(pl.col('path').str.split('/').list.last().alias('base'))
+    )
+
+    doubled.select(['base', 'score', 'path']).write_csv(output_file, include_header=False)
+
+    count = len(doubled)
+    print(f"Converted {csv_file} to {output_file} ({count} entries)")
+    return count > 0
+
+def _convert_with_pandas(csv_file, output_file, min_score=0.0, top_k=None):
+    """Vectorized version of convert_csv_to_similarity_scores.
+
+    Same output as the Python row loop, but the parsing, filtering,
+    interleaving, sort and basename extraction all run as columnar C
+    operations instead of per-row interpreter work.
+    """
+    df = pd.read_csv(csv_file, usecols=[0, 1, 2], header=0,
+                     names=['a', 'b', 's'], comment='#',
+                     dtype={'s': 'float64'})
+
+    if min_score > 0.0:
+        df = df[df['s'] >= min_score]
+    if top_k is not None:
+        df = df.nlargest(top_k, 's')
+
+    # Interleave the two file columns exactly like the row loop does
+    # (file1 entry then file2 entry per pair), then stable-sort by score
+    doubled = pd.DataFrame({
+        'path': df[['a', 'b']].to_numpy().ravel(),
+        'score': df['s'].to_numpy().repeat(2),
+    })
+    # Symmetric CSVs repeat the same (path, score) pair across many
+    # counterparts; keep only the first occurrence
+    doubled['key'] = doubled['score'].round(4)
+    doubled = doubled.drop_duplicates(subset=['path', 'key']).drop(columns='key')
+    doubled = doubled.sort_values('score', ascending=False, kind='stable')
+    doubled['base'] = doubled['path'].str.rsplit('/', n=1).str[-1]
+
+    doubled[['base', 'score', 'path']].to_csv(output_file, header=False, index=False)
+
+    count = len(doubled)
+    print(f"Converted {csv_file} to {output_file} ({count} entries)")
+    return count > 0
+
+def _basename(p):
+    # os.path.basename goes through os.fspath and posixpath on every
+    # call; our paths are always POSIX strings, so rpartition suffices
+    return p.rpartition('/')[2] or p
+
+# The same file paths repeat across rows and across the three similarity
+# types, so basename results are memoized once per distinct path
+_basename_cache = {}
+
+def cached_basename(path):
+    basename = _basename_cache.get(path)
+    if basename is None:
+        basename = _basename(path)
+        _basename_cache[path] = basename
+    return basename
+
+def convert_csv_to_similarity_scores(csv_file, output_file, min_score=0.0, top_k=None):
     """
     Converts a CSV file from similarity analysis to the format expected by cluster-scores.py
-    
+
     Args:
         csv_file (str): Path to the CSV file
         output_file (str): Path to write the output file
+        min_score (float): Drop pairs scoring below this value
+        top_k (int): Keep only the k best-scoring pairs (None keeps all)
     """
     if not os.path.exists(csv_file):
         print(f"Warning: File not found: {csv_file}")
         return False
-        
-    with open(csv_file, 'r') as f_in, open(output_file, 'w') as f_out:
+
+    if pl is not None:
+        return _convert_with_polars(csv_file, output_file, min_score, top_k)
+    if pd is not None:
+        return _convert_with_pandas(csv_file, output_file, min_score, top_k)
+
+    with open(csv_file, 'r') as f_in, open(output_file, 'w', buffering=1<<22) as f_out:
         reader = csv.reader(f_in)
         header = next(reader, None)  # Skip header
-        
+
         if not header:
             print(f"Warning: Empty file or no header: {csv_file}")
             return False
-            
-        # With this new code:
+
+        # Filter low-scoring pairs while streaming so the downstream
+        # clustering never sees the full O(N^2) pair list
+        pairs = ((row[0], row[1], float(row[2]))
+                 for row in reader if len(row) >= 3)
+        if min_score > 0.0:
+            pairs = (p for p in pairs if p[2] >= min_score)
+        if top_k is not None:
+            # Partial selection of the k best pairs, no full sort
+            pairs = heapq.nlargest(top_k, pairs, key=lambda p: p[2])
+
+        # Symmetric CSVs repeat the same (file, score) pair across many
+        # counterparts; emit only the first occurrence of each
         rows = []
-        for row in reader:
-            if len(row) >= 3:
-                file1, file2, score = row[0], row[1], float(row[2])
-                # Add both files to improve clustering
+        seen = set()
+        for file1, file2, score in pairs:
+            # Add both files to improve clustering
+            key1 = (file1, round(score, 4))
+            if key1 not in seen:
+                seen.add(key1)
                 rows.append((file1, score, file1))
+            key2 = (file2, round(score, 4))
+            if key2 not in seen:
+                seen.add(key2)
                 rows.append((file2, score, file2))
 
-        # Sort by score descending
-        rows.sort(key=lambda x: x[1], reverse=True)
+        # Sort by score descending; argsort on a contiguous float array
+        # beats the Python tuple sort once rows number in the millions
+        if np is not None:
+            scores = np.fromiter((score for _, score, _ in rows),
+                                 dtype=np.float64, count=len(rows))
+            rows = [rows[i] for i in np.argsort(-scores, kind='stable')]
+        else:
+            rows.sort(key=lambda x: x[1], reverse=True)
+
+        # Then write the sorted data as one big write instead of one
+        # small formatted write per row
+        f_out.write(''.join(
+            f"{cached_basename(file_path)},{score},{file_path}\n"
+            for file_path, score, path in rows
+        ))
+        count = len(rows)
 
-        # Then write the sorted data
-        count = 0
-        for file_path, score, path in rows:
-            f_out.write(f"{os.path.basename(file_path)},{score},{file_path}\n")
-            count += 1
-                
         print(f"Converted {csv_file} to {output_file} ({count} entries)")
         return True if count > 0 else False
 
@@ -53,297 +209,439 @@ def run_cluster_scores(script_path, working_dir, input_file, output_file, thresh
     if not os.path.exists(script_path):
         print(f"Error: Script not found: {script_path}")
         return False
-        
-    # Copy input file to working directory as similarity-scores.txt
+
+    # The script expects similarity-scores.txt in its working directory;
+    # link to the input instead of copying it, falling back to a copy on
+    # filesystems without symlink support
     temp_input = os.path.join(working_dir, "similarity-scores.txt")
-    if temp_input != input_file:
-        shutil.copy2(input_file, temp_input)
-    
-    original_dir = os.getcwd()
+    made_temp = temp_input != input_file
+    if made_temp:
+        if os.path.lexists(temp_input):
+            os.remove(temp_input)
+        try:
+            os.symlink(os.path.abspath(input_file), temp_input)
+        except OSError:
+            # copyfile uses sendfile/copy_file_range on Linux and skips
+            # the metadata pass copy2 would do
+            shutil.copyfile(input_file, temp_input)
+
     try:
-        # Change to working directory
-        os.chdir(working_dir)
-        
-        # Run the script
-        command = ["python3", script_path, "-t", str(threshold)]
-        result = subprocess.run(command, check=False, capture_output=True, text=True)
-        
-        if result.returncode != 0:
-            print(f"Warning: cluster-scores.py returned error: {result.returncode}")
-            print(f"STDERR: {result.stderr}")
-        
+        # Run the script in-process instead of spawning a fresh python3;
+        # this saves an interpreter startup per similarity type. Each
+        # similarity type already runs in its own worker process, so the
+        # scoped chdir cannot race with the others.
+        old_argv = sys.argv
+        old_cwd = os.getcwd()
+        sys.argv = [os.path.basename(script_path), "-t", str(threshold)]
+        try:
+            # contextlib.chdir would read nicer but needs 3.11; the
+            # readme promises 3.6+
+            os.chdir(working_dir)
+            runpy.run_path(script_path, run_name="__main__")
+        except SystemExit as e:
+            if e.code not in (0, None):
+                print(f"Warning: cluster-scores.py returned error: {e.code}")
+        except Exception as e:
+            print(f"Warning: cluster-scores.py failed: {e}")
+        finally:
+            os.chdir(old_cwd)
+            sys.argv = old_argv
+
         # Check if clusters.json was created
-        if os.path.exists("clusters.json"):
-            # Copy to output file
-            shutil.copy2("clusters.json", output_file)
+        temp_output = os.path.join(working_dir, "clusters.json")
+        if os.path.exists(temp_output):
+            # Rename into place instead of copying and deleting
+            os.replace(temp_output, output_file)
             print(f"Generated {output_file}")
             return True
         else:
             print("Error: clusters.json not found")
             return False
-    
+
     finally:
-        os.chdir(original_dir)
         # Clean up
-        if os.path.exists(temp_input) and temp_input != input_file:
+        if made_temp and os.path.lexists(temp_input):
             os.remove(temp_input)
-        
-        temp_output = os.path.join(working_dir, "clusters.json")
-        if os.path.exists(temp_output):
-            os.remove(temp_output)
 
+@functools.lru_cache(maxsize=4096)
 def extract_file_content(file_path, max_length=50):
-    """Extract meaningful content from a file for display purposes"""
+    """Extract meaningful content from a file for display purposes.
+
+    Paths recur across clusters within one run, so results are memoized;
+    the open/read chain runs at most once per distinct path.
+    """
     try:
-        print(f"DEBUG: Reading content from {file_path}")
-        if not os.path.exists(file_path):
-            print(f"DEBUG: File not found: {file_path}")
-            return os.path.basename(file_path)
-            
-        with open(file_path, 'r') as f:
-            content = f.read().strip()
-            result = content[:50]
-            print(f"DEBUG: Content: {result}")
-            return result
+        logger.debug("Reading content from %s", file_path)
+        # Only the first max_length characters matter, so read a bounded
+        # 512 bytes straight from the fd instead of slurping the file;
+        # a missing file surfaces as OSError rather than a stat up front
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            raw = os.read(fd, 512)
+        finally:
+            os.close(fd)
+        result = raw.decode('utf-8', 'ignore').strip()[:max_length]
+        logger.debug("Content: %s", result)
+        return result
     except Exception as e:
-        print(f"DEBUG: Error reading {file_path}: {str(e)}")
-        return os.path.basename(file_path)
+        logger.debug("Error reading %s: %s", file_path, e)
+        return _basename(file_path)
+
+# Cluster naming tokens: alphabetic words of 4+ chars, minus stopwords
+_STOPWORDS = frozenset({'the', 'and', 'was', 'for', 'that', 'this', 'with', 'have',
+                        'were', 'they', 'our', 'what', 'when', 'from', 'your', 'been'})
 
 def name_cluster_by_common_terms(items, content_dict=None):
     """Name a cluster based on common terms found in its items"""
     all_content = []
     for item in items:
         path = item.get("path", "")
-        item_name = item.get("name", "")
-        item_key = os.path.basename(path)
-        content = None
-        
-        # Try all possible ways to get content
-        if content_dict and item_key in content_dict:
-            content = content_dict[item_key]
-        elif content_dict and path in content_dict:
-            content = content_dict[path]
-        elif path and os.path.exists(path):
-            try:
-                with open(path, 'r') as f:
-                    content = f.read()
-            except:
-                pass
-                
+
+        # The preload keys every document by basename, so a single dict
+        # lookup replaces the old path/exists/open fallback chain
+        content = content_dict.get(cached_basename(path)) if content_dict else None
         if not content:
-            content = item_name
-            
+            content = item.get("name", "")
+
         all_content.append(content)
     
     if not all_content:
         return "Cluster"
     
-    # Extract meaningful words
-    from collections import Counter
-    import re
-    
-    words = []
+    # Stream tokens straight into the counter; no intermediate word list
+    counter = Counter()
     for content in all_content:
-        words.extend(re.findall(r'\b[a-zA-Z]{4,}\b', content.lower()))
-    
-    # Expanded stopwords list
-    stopwords = {'the', 'and', 'was', 'for', 'that', 'this', 'with', 'have', 
-                'were', 'they', 'our', 'what', 'when', 'from', 'your', 'been'}
-    words = [w for w in words if w not in stopwords]
-    
+        counter.update(tok for tok in content.lower().split()
+                       if len(tok) >= 4 and tok.isalpha() and tok not in _STOPWORDS)
+
     # Get most common terms
-    most_common = Counter(words).most_common(3)
+    most_common = counter.most_common(3)
     if most_common:
         terms = [term for term, _ in most_common]
         return f"Cluster: {', '.join(terms)}"
     else:
         return "Cluster"
 
-def create_circle_json(clusters_json_path, output_file, content_dict=None):
+def write_json(obj, output_file):
+    """Write a visualization JSON file.
 
-    if not os.path.exists(clusters_json_path):
-        print(f"Error: Clusters file not found: {clusters_json_path}")
-        return False
-    
-    try:
-        with open(clusters_json_path, 'r') as f:
-            clusters_data = json.load(f)
-        
-        # Convert to circle packing format
-        circle_data = {
-            "name": "root",
-            "children": []
-        }
-        
-        if "children" in clusters_data:
-            for i, cluster in enumerate(clusters_data["children"]):
-                # cluster_node = {
-                #     "name": name_cluster_by_common_terms(cluster.get("children", [])),  # Using content-based name
-                #     "children": []
-                # }
-                cluster_node = {
-                    "name": name_cluster_by_common_terms(cluster.get("children", []), content_dict),  # Pass content_dict
-                    "children": []
-                }
-                
-                if "children" in cluster:
-                    for j, item in enumerate(cluster["children"]):
-                        item_path = item.get("path", "")
-                        item_name_key = os.path.basename(item_path)  # This is the UUID filename
-                        
-                        # Try all possible ways to get meaningful content
-                        if content_dict and item_name_key in content_dict:
-                            item_name = content_dict[item_name_key]
-                            print(f"Using content from dictionary: {item_name[:20]}...")
-                        elif content_dict and item_path in content_dict:
-                            item_name = content_dict[item_path]
-                        elif os.path.exists(item_path):
-                            # Direct file access as fallback
-                            with open(item_path, 'r') as f:
-                                item_name = f.readline().strip()[:50]
-                        else:
-                            # Last resort - use the name from JSON
-                            item_name = item.get("name", f"Item {j+1}")
-                                
-                            # Add to the cluster node with score
-                            try:
-                                item_score = float(item.get("score", 0.5))
-                            except (ValueError, TypeError):
-                                item_score = 0.5
-                            
-                            cluster_node["children"].append({
-                                "name": item_name,
-                                "size": int(100 + item_score * 1900)
-                            })
-                
-                circle_data["children"].append(cluster_node)
-        
+    orjson's Rust encoder indents essentially for free, so that path
+    stays human-readable; the stdlib fallback writes compact output
+    instead, since indent=2 roughly doubles the bytes and runs through
+    the slow pure-Python pretty-printer, and only the D3 pages consume
+    these files.
+    """
+    if orjson is not None:
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
         with open(output_file, 'w') as f:
-            json.dump(circle_data, f, indent=2)
-        
-        print(f"Created circle.json: {output_file}")
-        return True
-    
-    except Exception as e:
-        print(f"Error creating circle.json: {e}")
-        return False
+            json.dump(obj, f, separators=(',', ':'))
+
+def resolve_item_name(item, content_dict, default=None):
+    """Resolve an item's display name with a single dict lookup.
 
-def create_d3_cluster_json(clusters_json_path, output_file, content_dict=None):
+    The preload in main() already read every document snippet, so there
+    is no need to stat or re-open files here.
     """
-    Create a D3 cluster JSON from a clusters.json file
-    
-    Args:
-        clusters_json_path (str): Path to the clusters.json file
-        output_file (str): Path to write the D3 cluster file
+    if content_dict:
+        content = content_dict.get(cached_basename(item.get("path", "")))
+        if content:
+            # Snippets repeat across clusters and output formats; intern
+            # so every occurrence shares one string object
+            return sys.intern(content)
+    return item.get("name") or default
+
+def iter_clusters(clusters_json_path):
+    """Yield top-level cluster dicts from a clusters.json file.
+
+    Streams them one at a time with ijson when it is installed, so large
+    graphs never sit fully materialized in memory; otherwise parses the
+    whole document up front.
+    """
+    if ijson is not None:
+        with open(clusters_json_path, 'rb') as f:
+            yield from ijson.items(f, 'children.item')
+        return
+    with open(clusters_json_path, 'rb') as f:
+        # One contiguous bytes buffer for the C parser either way;
+        # json.load(f) would go through a Python-level read/decode
+        # wrapper instead
+        buf = f.read()
+    clusters_data = orjson.loads(buf) if orjson is not None else json.loads(buf)
+    yield from clusters_data.get("children", [])
+
+def build_visualisations(clusters_json_path, circle_output, d3_output, content_dict=None):
+    """Build both visualization JSONs from clusters.json in one traversal.
+
+    The circle-packing hierarchy and the D3 force-directed graph used to
+    be produced by two separate functions, each parsing clusters.json
+    and re-deriving every cluster name and item name. Fusing them means
+    one parse and one naming pass per cluster instead of two.
     """
     if not os.path.exists(clusters_json_path):
         print(f"Error: Clusters file not found: {clusters_json_path}")
         return False
-    
+
     try:
-        with open(clusters_json_path, 'r') as f:
-            clusters_data = json.load(f)
-        
-        # Create D3 force-directed graph format
+        # Circle packing format
+        circle_data = {
+            "name": "root",
+            "children": []
+        }
+        # D3 force-directed graph format
         nodes = [{"name": "Root", "group": 1}]
         links = []
-    
-        if "children" in clusters_data:
-            # First create cluster nodes
-            for i, cluster in enumerate(clusters_data["children"]):
-                cluster_id = len(nodes)
-                #cluster_name = name_cluster_by_common_terms(cluster.get("children", []))
-                cluster_name = name_cluster_by_common_terms(cluster.get("children", []), content_dict)
-                nodes.append({"name": cluster_name, "group": 2})
-                links.append({"source": 0, "target": cluster_id, "value": 2})  # Link to root
-                
-                # Then create item nodes that link to their parent cluster
-                if "children" in cluster:
-                    for j, item in enumerate(cluster["children"]):
-                        item_id = len(nodes)
-                        item_path = item.get("path", "")
-                        
-                        # Extract content for better naming
-                        try:
-                            if content_dict and os.path.basename(item_path) in content_dict:
-                                item_name = content_dict[os.path.basename(item_path)]
-                            elif content_dict and item_path in content_dict:
-                                item_name = content_dict[item_path]
-                            elif item_path and os.path.exists(item_path):
-                                with open(item_path, 'r') as f:
-                                    first_line = f.readline().strip()[:50]
-                                    item_name = first_line if first_line else os.path.basename(item_path)
-                            else:
-                                item_name = item.get("name", f"Item {j+1}")
-                        except:
-                            item_name = item.get("name", f"Item {j+1}")
-                        
-                        nodes.append({"name": item_name, "group": 3})
-                        links.append({"source": cluster_id, "target": item_id, "value": 1})  # Link to parent cluster
-        
-        d3_data = {"nodes": nodes, "links": links}
-        with open(output_file, 'w') as f:
-            json.dump(d3_data, f, indent=2)
-        
-        print(f"Created D3 cluster format: {output_file}")
+
+        for i, cluster in enumerate(iter_clusters(clusters_json_path)):
+            cluster_name = sys.intern(
+                name_cluster_by_common_terms(cluster.get("children", []), content_dict))
+
+            cluster_node = {
+                "name": cluster_name,
+                "children": []
+            }
+            cluster_id = len(nodes)
+            nodes.append({"name": cluster_name, "group": 2})
+            links.append({"source": 0, "target": cluster_id, "value": 2})  # Link to root
+
+            if "children" in cluster:
+                for j, item in enumerate(cluster["children"]):
+                    item_name = resolve_item_name(item, content_dict, f"Item {j+1}")
+
+                    # Add to the cluster node with score
+                    try:
+                        item_score = float(item.get("score", 0.5))
+                    except (ValueError, TypeError):
+                        item_score = 0.5
+
+                    cluster_node["children"].append({
+                        "name": item_name,
+                        "size": int(100 + item_score * 1900)
+                    })
+
+                    item_id = len(nodes)
+                    nodes.append({"name": item_name, "group": 3})
+                    links.append({"source": cluster_id, "target": item_id, "value": 1})  # Link to parent cluster
+
+            circle_data["children"].append(cluster_node)
+
+        write_json(circle_data, circle_output)
+        print(f"Created circle.json: {circle_output}")
+
+        write_json({"nodes": nodes, "links": links}, d3_output)
+        print(f"Created D3 cluster format: {d3_output}")
         return True
-        
+
     except Exception as e:
-        print(f"Error creating D3 cluster JSON: {e}")
+        print(f"Error creating visualization JSON: {e}")
         return False
     
-def run_circle_packing(results_dir, sim_type):
+def write_circle_scores(csv_file, txt_file):
+    """Rewrite a pair CSV into circle-packing.py's basename,score,{} format.
+
+    With polars installed the conversion runs as a lazy streaming
+    pipeline entirely in native code; otherwise it falls back to the
+    csv.reader loop.
+    """
+    if pl is not None:
+        (pl.scan_csv(str(csv_file), has_header=True,
+                     new_columns=['a', 'b', 's'], comment_prefix='#',
+                     schema_overrides={'s': pl.Float64})
+           .select(pl.col('a').str.split('/').list.last().alias('base'),
+                   pl.col('s'),
+                   pl.lit('{}').alias('meta'))
+           .sink_csv(str(txt_file), include_header=False, quote_style='never'))
+        return
+
+    with open(csv_file, 'r') as f_in, open(txt_file, 'w', buffering=1<<22) as f_out:
+        reader = csv.reader(f_in)
+        header = next(reader, None)  # Skip header
+
+        # Format needed by circle-packing.py; one join and one write
+        # instead of a formatted write per row
+        f_out.write(''.join(
+            f"{cached_basename(row[0])},{float(row[2])},{{}}\n"
+            for row in reader if len(row) >= 3
+        ))
+
+def run_circle_packing(results_dir, sim_type, work_dir=None):
     """Run the original circle-packing visualization"""
     project_root = Path(__file__).parent.parent
     circle_packing_script = project_root / "tika-similarity" / "tikasimilarity" / "cluster" / "circle-packing.py"
-    
+
     if not os.path.exists(circle_packing_script):
         print(f"Error: Circle packing script not found: {circle_packing_script}")
         return False
-        
+
+    if work_dir is None:
+        work_dir = results_dir
+
     # Create a properly formatted similarity-scores.txt for the script
     txt_file = results_dir / f"{sim_type}_similarity-scores.txt"
     circle_json = results_dir / f"{sim_type}_metadata_circle.json"
-    
+
     # Need to convert your CSV to the expected format
     csv_file = results_dir / f"{sim_type}_similarity.csv"
-    
+
     if not os.path.exists(csv_file):
         print(f"Error: CSV file not found: {csv_file}")
         return False
-    
+
     # Convert to the specific format needed by circle-packing.py
-    with open(csv_file, 'r') as f_in, open(txt_file, 'w') as f_out:
-        reader = csv.reader(f_in)
-        header = next(reader, None)  # Skip header
-        
-        for row in reader:
-            if len(row) >= 3:
-                file1, file2, score = row[0], row[1], float(row[2])
-                # Format needed by circle-packing.py:
-                f_out.write(f"{os.path.basename(file1)},{score},{{}}\n")
-    
-    # Change to results directory
-    original_dir = os.getcwd()
-    os.chdir(results_dir)
-    
+    write_circle_scores(csv_file, txt_file)
+
+    # Run the circle packing script in the scratch directory so its
+    # fixed circle.json output cannot collide with other types
+    command = [sys.executable, str(circle_packing_script)]
+    subprocess.run(command, check=False, cwd=work_dir)
+
+    # Rename the output file
+    temp_circle = os.path.join(work_dir, "circle.json")
+    if os.path.exists(temp_circle):
+        shutil.move(temp_circle, circle_json)
+        print(f"Created metadata circle visualization: {circle_json}")
+        return True
+    else:
+        print("Error: circle.json not created")
+        return False
+
+def read_first_snippet(path):
+    """Read the first line (at most 50 chars) of a file with one raw read.
+
+    Returns None if the file cannot be read; small reads release the GIL
+    so this scales across a thread pool.
+    """
     try:
-        # Run the circle packing script
-        command = [sys.executable, str(circle_packing_script)]
-        subprocess.run(command, check=False)
-        
-        # Rename the output file
-        if os.path.exists("circle.json"):
-            shutil.move("circle.json", circle_json)
-            print(f"Created metadata circle visualization: {circle_json}")
-            return True
-        else:
-            print("Error: circle.json not created")
-            return False
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            buf = os.read(fd, 128)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.warning("Could not read %s: %s", path, e)
+        return None
+    newline = buf.find(b'\n')
+    if newline >= 0:
+        buf = buf[:newline]
+    return buf.decode('utf-8', 'replace').strip()[:50]
+
+def process_similarity_type(sim_type, results_dir, tika_cluster_dir, document_content,
+                            min_score=0.0, top_k=None):
+    """Run conversion, clustering and JSON generation for one similarity type.
+
+    Runs in its own worker process; each type gets a private scratch
+    directory so the fixed similarity-scores.txt / clusters.json /
+    circle.json filenames used by the tika scripts cannot collide.
+    """
+    print(f"\n===== Processing {sim_type} =====")
+
+    # Define paths for this similarity type
+    csv_file = results_dir / f"{sim_type}.csv"
+    txt_file = results_dir / f"{sim_type}.txt"
+
+    # Skip if CSV file doesn't exist
+    if not csv_file.exists():
+        print(f"Warning: CSV file not found: {csv_file}")
+        return False
+
+    # Step 1: Convert CSV to similarity scores format
+    print(f"Converting CSV to similarity scores format")
+    if not convert_csv_to_similarity_scores(str(csv_file), str(txt_file),
+                                            min_score=min_score, top_k=top_k):
+        print(f"Error converting {csv_file} to similarity scores format")
+        return False
+
+    print(f"Running clustering scripts for {sim_type}")
+
+    work_dir = results_dir / f"{sim_type}_work"
+    work_dir.mkdir(exist_ok=True)
+    try:
+        # Step 2: Run cluster-scores.py to generate clusters.json
+        cluster_scores_script = tika_cluster_dir / "cluster-scores.py"
+        clusters_json = results_dir / f"{sim_type}_clusters.json"
+        print(f"  Generating clusters.json")
+        run_cluster_scores(
+            str(cluster_scores_script),
+            str(work_dir),
+            str(txt_file),
+            str(clusters_json),
+            0.01  # Threshold
+        )
+
+        # Steps 3+4: Create circle packing and D3 visualization formats
+        # in one pass over clusters.json
+        circle_json = results_dir / f"{sim_type}_circle.json"
+        cluster_d3_json = results_dir / f"{sim_type}_cluster_d3.json"
+        print(f"  Creating circle packing and D3 cluster visualization formats")
+        build_visualisations(str(clusters_json), str(circle_json),
+                             str(cluster_d3_json), document_content)
+
+        # Step 5: Add the circle packing visualization (original Tika method)
+        print(f"  Creating metadata-based circle packing visualization")
+        run_circle_packing(results_dir, sim_type, work_dir)
     finally:
-        os.chdir(original_dir)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return True
+
+def load_document_content(data_dir):
+    """Build the document snippet map, reusing a cache file across runs.
+
+    The walk over data/haunted_places is only repeated when some data
+    file is newer than the cache; otherwise the whole map is restored
+    with a single read of data/.content_cache.json.
+    """
+    cache_file = data_dir.parent / ".content_cache.json"
+
+    with os.scandir(data_dir) as entries:
+        files = [(entry.path, entry.name, entry.stat().st_mtime)
+                 for entry in entries if entry.is_file()]
+    newest = max((mtime for _, _, mtime in files), default=0.0)
+
+    if cache_file.exists() and cache_file.stat().st_mtime >= newest:
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = orjson.loads(f.read()) if orjson is not None else json.load(f)
+            print(f"Loaded document content cache ({len(cached)} keys)")
+            return cached
+        except (ValueError, OSError):
+            pass  # stale or unreadable cache; fall through to a fresh walk
+
+    print("Pre-loading document content...")
+    document_content = {}
+
+    # The preload is latency-bound on tiny reads, so issue them from
+    # a thread pool to overlap the per-file open/read syscalls
+    with concurrent.futures.ThreadPoolExecutor(max_workers=32) as pool:
+        snippets = pool.map(read_first_snippet,
+                            (path for path, _, _ in files), chunksize=64)
+        for (path, name, _), content in zip(files, snippets):
+            if content is None:
+                continue
+            # Every lookup goes through the basename, so one canonical
+            # key per file keeps the dict a third of the old size
+            document_content[name] = content
+
+    try:
+        with open(cache_file, 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(document_content))
+            else:
+                f.write(json.dumps(document_content, separators=(',', ':')).encode('utf-8'))
+    except OSError as e:
+        print(f"Warning: could not write content cache: {e}")
+
+    return document_content
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate cluster data from similarity CSVs")
+    parser.add_argument("--min-score", type=float, default=0.0,
+                      help="Drop similarity pairs scoring below this value")
+    parser.add_argument("--top-k", type=int, default=None,
+                      help="Keep only the k best-scoring pairs per similarity type")
+    args = parser.parse_args()
+
     # Get project paths
     project_root = Path(__file__).parent.parent
     results_dir = project_root / "similarity-results"
@@ -352,29 +650,11 @@ def main():
     # Create results directory if it doesn't exist
     results_dir.mkdir(exist_ok=True)
     document_content = {}
-    
-    # Start of main() function after loading document_content
-    print(f"Loaded {len(document_content)} document contents:")
-    for i, (key, value) in enumerate(list(document_content.items())[:5]):
-        print(f"  Sample {i+1}: {key} -> {value[:30]}")
-    
+
     # Get actual content from files in haunted_places directory
     data_dir = project_root / "data" / "haunted_places"
     if data_dir.exists():
-        print("Pre-loading document content...")
-        for file_path in data_dir.glob("*"):
-            if file_path.is_file():
-                try:
-                    with open(file_path, 'r') as f:
-                        first_line = f.readline().strip()
-                        content = first_line[:50]
-                        # Store with both full path and basename as keys
-                        document_content[str(file_path)] = content
-                        document_content[file_path.name] = content
-                        # Also store without extension
-                        document_content[file_path.stem] = content
-                except Exception as e:
-                    print(f"Could not read {file_path}: {e}")
+        document_content = load_document_content(data_dir)
     
     # Define the similarity types to process
     similarity_types = [
@@ -383,52 +663,18 @@ def main():
         "edit_value_similarity"  # Using edit_value instead of edit_distance
     ]
     
-    for sim_type in similarity_types:
-        print(f"\n===== Processing {sim_type} =====")
-        
-        # Define paths for this similarity type
-        csv_file = results_dir / f"{sim_type}.csv"
-        txt_file = results_dir / f"{sim_type}.txt"
-        
-        # Skip if CSV file doesn't exist
-        if not csv_file.exists():
-            print(f"Warning: CSV file not found: {csv_file}")
-            continue
-            
-        # Step 1: Convert CSV to similarity scores format
-        print(f"Converting CSV to similarity scores format")
-        if not convert_csv_to_similarity_scores(str(csv_file), str(txt_file)):
-            print(f"Error converting {csv_file} to similarity scores format")
-            continue
-        
-        print(f"Running clustering scripts for {sim_type}")
-        
-        # Step 2: Run cluster-scores.py to generate clusters.json
-        cluster_scores_script = tika_cluster_dir / "cluster-scores.py"
-        clusters_json = results_dir / f"{sim_type}_clusters.json"
-        print(f"  Generating clusters.json")
-        run_cluster_scores(
-            str(cluster_scores_script), 
-            str(results_dir),
-            str(txt_file),
-            str(clusters_json),
-            0.01  # Threshold
-        )
-        
-        # Step 3: Create circle.json for circle packing visualization
-        circle_json = results_dir / f"{sim_type}_circle.json"
-        print(f"  Creating circle.json for circle packing visualization")
-        create_circle_json(str(clusters_json), str(circle_json), document_content)
-        
-        # Step 4: Create D3 JSON for cluster visualization
-        cluster_d3_json = results_dir / f"{sim_type}_cluster_d3.json"
-        print(f"  Creating D3 cluster visualization format")
-        create_d3_cluster_json(str(clusters_json), str(cluster_d3_json), document_content)
-        
-         # Step 5: Add the circle packing visualization (original Tika method)
-        print(f"  Creating metadata-based circle packing visualization")
-        run_circle_packing(results_dir, sim_type)
-    
+    # The three similarity types are fully independent, so process them
+    # in parallel, one worker per type
+    with concurrent.futures.ProcessPoolExecutor(max_workers=len(similarity_types)) as pool:
+        futures = [
+            pool.submit(process_similarity_type, sim_type, results_dir,
+                        tika_cluster_dir, document_content,
+                        args.min_score, args.top_k)
+            for sim_type in similarity_types
+        ]
+        for future in futures:
+            future.result()
+
     print("\nAll JSON files generated successfully in:", results_dir)
     print("The following files can be used with visualization HTML files:")
     print("  *_clusters.json - Basic cluster visualization")
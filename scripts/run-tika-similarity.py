@@ -5,11 +5,14 @@ os.environ["TIKA_STARTUP_MAX_RETRY"] = "10"
 os.environ["TIKA_TIMEOUT"] = "1200"  # 20-minute timeout
 import sys
 import argparse
+import concurrent.futures
+import select
 import subprocess
 import time
-import random 
+import random
 
-def run_similarity_analysis(similarity_type="cosine", input_dir=None, sample_size=None):
+def run_similarity_analysis(similarity_type="cosine", input_dir=None, sample_size=None,
+                            log_file=None, force=False):
 
     start_time = time.time()
     # Get the project root directory
@@ -21,36 +24,57 @@ def run_similarity_analysis(similarity_type="cosine", input_dir=None, sample_siz
     
     # Validate input directory
     try:
-        all_files = [f for f in os.listdir(input_dir) if os.path.isfile(os.path.join(input_dir, f))]
+        # scandir reuses the dirent type/stat info, avoiding an extra
+        # stat per file; mtimes feed the freshness check below
+        all_files = []
+        newest_input = 0.0
+        with os.scandir(input_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    all_files.append(entry.name)
+                    newest_input = max(newest_input, entry.stat().st_mtime)
         file_count = len(all_files)
         print(f"Found {file_count} files in {input_dir}")
         
         if file_count == 0:
             print("Error: No files found in input directory!")
             return 1
-            
+
+        # Re-runs during iteration are common; skip the heavy subprocess
+        # (and the sample staging) when the existing CSV is already newer
+        # than every input file
+        output_file = os.path.join(project_root, "similarity-results",
+                                   f"{similarity_type}_similarity.csv")
+        if (not force and os.path.exists(output_file)
+                and os.path.getmtime(output_file) > newest_input):
+            print(f"{output_file} is up to date, skipping {similarity_type} "
+                  f"analysis (use --force to re-run)")
+            return 0
+
         # Apply sampling if requested
         if sample_size and sample_size < file_count:
             print(f"Using a random sample of {sample_size} files (out of {file_count})")
             
-            # Create a temporary directory for the sample
-            temp_dir = os.path.join(project_root, "data", "sample_files")
+            # Create a temporary directory for the sample; one per
+            # similarity type so parallel runs do not collide
+            temp_dir = os.path.join(project_root, "data", f"sample_files_{similarity_type}")
             os.makedirs(temp_dir, exist_ok=True)
             
             # Clear any existing files in the temp directory
-            for file in os.listdir(temp_dir):
-                file_path = os.path.join(temp_dir, file)
-                if os.path.isfile(file_path):
-                    os.unlink(file_path)
-            
+            with os.scandir(temp_dir) as entries:
+                stale = [entry.path for entry in entries if entry.is_file()]
+
             # Select a random sample of files
             sampled_files = random.sample(all_files, sample_size)
-            
-            # Create symbolic links to the sampled files
-            for file in sampled_files:
-                src = os.path.join(input_dir, file)
-                dst = os.path.join(temp_dir, file)
-                os.symlink(src, dst)
+
+            # Symlink creation is latency-bound metadata work, so issue
+            # the unlinks and links from a thread pool
+            def link_sample(file):
+                os.symlink(os.path.join(input_dir, file), os.path.join(temp_dir, file))
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=16) as pool:
+                list(pool.map(os.unlink, stale))
+                list(pool.map(link_sample, sampled_files))
             
             # Use the temporary directory for analysis
             actual_input_dir = temp_dir
@@ -107,33 +131,47 @@ def run_similarity_analysis(similarity_type="cosine", input_dir=None, sample_siz
     print(f"Running {similarity_type} similarity analysis...")
     print(f"Command: {' '.join(command)}")
     
+    # When running several types in parallel, each child's output goes
+    # to its own log file instead of interleaving on the console
+    log_fh = open(log_file, 'w', buffering=1<<16) if log_file else None
     try:
         start = time.time()
         process = subprocess.Popen(
             command,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True
+            stderr=subprocess.PIPE
         )
-        
+
         # Show progress
         print("Processing files, please wait...")
-        
-        # Stream output in real-time
-        while True:
-            output = process.stdout.readline()
-            if output == '' and process.poll() is not None:
-                break
-            if output:
-                print(output.strip())
-        
+
+        # Drain both pipes with bulk 64K reads on non-blocking fds
+        # instead of a Python-level readline call per output line
+        out_fd = process.stdout.fileno()
+        err_fd = process.stderr.fileno()
+        os.set_blocking(out_fd, False)
+        os.set_blocking(err_fd, False)
+        pending = {out_fd, err_fd}
+        err_buf = bytearray()
+
+        while pending:
+            ready, _, _ = select.select(list(pending), [], [], 0.1)
+            for fd in ready:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    pending.discard(fd)
+                elif fd == err_fd:
+                    err_buf.extend(chunk)
+                else:
+                    text = chunk.decode('utf-8', 'replace')
+                    if log_fh:
+                        log_fh.write(text)
+                    else:
+                        print(text, end='')
+
         # Get the return code
-        returncode = process.poll()
-        
-        # Print any remaining output
-        stdout, stderr = process.communicate()
-        if stdout:
-            print(stdout)
+        returncode = process.wait()
+        stderr = err_buf.decode('utf-8', 'replace')
         
         elapsed = time.time() - start
         
@@ -154,6 +192,8 @@ def run_similarity_analysis(similarity_type="cosine", input_dir=None, sample_siz
         print(f"Error running similarity script: {e}")
         return 1
     finally:
+        if log_fh:
+            log_fh.close()
         # Clean up the temporary directory if we created one
         if sample_size and sample_size < file_count and 'temp_dir' in locals():
             try:
@@ -170,30 +210,45 @@ def main():
                       default="cosine", help="Type of similarity to calculate")
     parser.add_argument("--input-dir", help="Directory containing the files to analyze")
     parser.add_argument("--sample-size", type=int, help="Number of files to randomly sample (speeds up processing)")
-    
+    parser.add_argument("--force", action="store_true",
+                      help="Re-run the analysis even if the output CSV is newer than the inputs")
+
     args = parser.parse_args()
     
     # Record the start time
     start_time = time.time()
     
     if args.type == "all":
-        # Run all three similarity analyses
-        for sim_type in ["cosine", "jaccard", "edit_value"]:
-            print(f"\n{'-'*80}")
-            print(f"Running {sim_type} similarity analysis")
-            print(f"{'-'*80}")
-            
-            type_start = time.time()
-            return_code = run_similarity_analysis(sim_type, args.input_dir, args.sample_size)
-            type_elapsed = time.time() - type_start
-            
-            print(f"{sim_type} analysis completed in {type_elapsed:.2f} seconds")
-            
-            if return_code != 0:
-                sys.exit(return_code)
+        # The three analyses are independent subprocesses, so run them
+        # concurrently; total wall time becomes the slowest type rather
+        # than the sum of all three
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        results_dir = os.path.join(project_root, "similarity-results")
+        os.makedirs(results_dir, exist_ok=True)
+
+        print(f"\nRunning cosine, jaccard and edit_value similarity analyses in parallel")
+        print(f"Per-type output is logged to {results_dir}/<type>_run.log")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as pool:
+            futures = {
+                pool.submit(run_similarity_analysis, sim_type, args.input_dir,
+                            args.sample_size,
+                            os.path.join(results_dir, f"{sim_type}_run.log"),
+                            args.force): sim_type
+                for sim_type in ["cosine", "jaccard", "edit_value"]
+            }
+            for future in concurrent.futures.as_completed(futures):
+                sim_type = futures[future]
+                return_code = future.result()
+                print(f"{sim_type} analysis completed after "
+                      f"{time.time() - start_time:.2f} seconds")
+
+                if return_code != 0:
+                    sys.exit(return_code)
     else:
         # Run just the specified similarity type
-        return_code = run_similarity_analysis(args.type, args.input_dir, args.sample_size)
+        return_code = run_similarity_analysis(args.type, args.input_dir, args.sample_size,
+                                              force=args.force)
         if return_code != 0:
             sys.exit(return_code)
     
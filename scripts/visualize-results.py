@@ -1,44 +1,197 @@
+import concurrent.futures
+import itertools
+import logging
 import os
 import json
 import shutil
 import webbrowser
 import http.server
-import socketserver
-import random
 import re
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Per-file diagnostics are debug-level; enable with LOG_LEVEL=DEBUG.
+# The bare format keeps console output as readable as the prints were
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(message)s")
+
+def load_json(path):
+    """Parse a JSON file, via orjson's native decoder when available."""
+    with open(path, 'rb') as f:
+        buf = f.read()
+    return orjson.loads(buf) if orjson is not None else json.loads(buf)
+
+def write_json(obj, path, indent=False):
+    """Write a JSON file, via orjson's native encoder when available.
+
+    Compact by default since the visualization pages only machine-read
+    these files; pass indent=True for human-facing copies.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        # Encode before touching the destination so an encoding error
+        # never leaves behind a truncated file; orjson hands back the
+        # whole payload as one bytes object, so write it with a single
+        # syscall on a raw fd instead of going through the buffered
+        # file object
+        payload = orjson.dumps(obj, option=option)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+    else:
+        with open(path, 'w') as f:
+            if indent:
+                json.dump(obj, f, indent=2)
+            else:
+                json.dump(obj, f, separators=(',', ':'))
+
+# Cluster items carry POSIX string paths, so rpartition replaces the
+# os.fspath/posixpath machinery in os.path.basename; the same paths
+# repeat across the three visualization formats, so results are memoized
+_basename_cache = {}
+
+def _basename(path):
+    name = _basename_cache.get(path)
+    if name is None:
+        name = path.rpartition('/')[2] or path
+        _basename_cache[path] = name
+    return name
+
+def _coerce_score(value):
+    """Parse a score to float, returning NaN for missing or bad values."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float('nan')
+
+def _enhance_cluster(cluster):
+    """Add necessary fields (name, size) to one cluster's items in place."""
+    pending = []
+    for i, item in enumerate(cluster.get("children", [])):
+        # Already enhanced (size is always set below); repeat visits of
+        # the same cluster are O(1) per item
+        if "size" in item:
+            continue
+
+        # Add name if missing
+        if "name" not in item:
+            if "path" in item:
+                item["name"] = _basename(item["path"])
+            else:
+                item["name"] = f"Item_{i+1}"
+
+        pending.append(item)
+
+    if not pending:
+        return
+
+    # Add size for circle packing visualization, scaling score to a
+    # reasonable range (100-2000), with 500 as the default size
+    if np is not None:
+        # One contiguous vectorized pass over the scores instead of a
+        # per-item float()/try/except round-trip
+        scores = np.fromiter((_coerce_score(item.get("score")) for item in pending),
+                             dtype=np.float64, count=len(pending))
+        sizes = np.where(np.isnan(scores), 500.0, 100.0 + scores * 1900.0)
+        for item, size in zip(pending, sizes):
+            item["size"] = int(size)
+    else:
+        for item in pending:
+            try:
+                item["size"] = int(100 + float(item["score"]) * 1900)
+            except (KeyError, ValueError, TypeError):
+                item["size"] = 500  # Default size
+
 def enhance_cluster_data(data):
     """Add necessary fields (name, size) to cluster data for visualization"""
     if not isinstance(data, dict) or "children" not in data:
-        print("Warning: Invalid cluster data format")
+        logger.warning("Invalid cluster data format")
         return data
-        
+
     # Process each cluster
     for cluster in data["children"]:
         if "children" in cluster:
-            for i, item in enumerate(cluster["children"]):
-                # Add name if missing
-                if "name" not in item:
-                    if "path" in item:
-                        item["name"] = os.path.basename(item["path"])
-                    else:
-                        item["name"] = f"Item_{i+1}"
-                
-                # Add size for circle packing visualization
-                if "score" in item:
-                    # Make sure score is converted to numeric value
-                    try:
-                        score_value = float(item["score"])
-                        # Scale score to reasonable size (100-2000)
-                        item["size"] = int(100 + score_value * 1900)
-                    except (ValueError, TypeError):
-                        item["size"] = 500  # Default size
-                else:
-                    item["size"] = 500  # Default size
-    
+            _enhance_cluster(cluster)
+
     return data
 
+def iter_clusters(clusters_file):
+    """Stream top-level cluster dicts from a clusters.json file with ijson.
+
+    Only used when ijson is installed; a consumer that stops early never
+    pays for parsing the rest of the file.
+    """
+    with open(clusters_file, 'rb') as f:
+        # use_float keeps scores as plain floats; ijson's default
+        # decimal.Decimal would be rejected by the JSON encoders when
+        # the streamed dicts are written back out
+        yield from ijson.items(f, 'children.item', use_float=True)
+
+def format_cluster_d3(clusters):
+    """Build the cluster-d3 payload from an iterable of cluster dicts.
+
+    Consumes the clusters lazily and stops after 50 qualifying ones, so
+    a streaming source is never drained past what the page can show.
+    """
+    # Only include clusters with at least 2 items, and stop pulling from
+    # the source once 50 have qualified
+    qualifying = (cluster for cluster in clusters
+                  if len(cluster.get("children") or ()) >= 2)
+
+    limited_children = []
+    for cluster in itertools.islice(qualifying, 50):
+        children = cluster["children"]
+
+        if "name" not in cluster:
+            cluster["name"] = f"Cluster_{cluster.get('id', 'unknown')}"
+
+        # Limit items in each cluster if there are too many; a shallow
+        # copy keeps the truncation out of children lists shared with
+        # the other visualization formats
+        if len(children) > 10:
+            cluster = {**cluster, "children": children[:10]}
+
+        # Ensure each item has a name (and a size, for consistency with
+        # the other formats)
+        _enhance_cluster(cluster)
+
+        limited_children.append(cluster)
+
+    return {
+        "name": "clusters",
+        "children": limited_children
+    }
+
+def _copy_if_newer(src, dst):
+    """Copy src to dst unless dst is already as new as src.
+
+    shutil.copyfile takes the platform zero-copy fast path
+    (sendfile/copy_file_range on Linux) and skips copy2's extra
+    metadata pass; the mtime check makes warm re-runs free.
+    """
+    try:
+        if os.path.getmtime(dst) >= os.path.getmtime(src):
+            return
+    except OSError:
+        pass
+    shutil.copyfile(src, dst)
+
 def copy_dependencies(tika_html_dir, viz_dir):
     """Copy all necessary dependencies for visualizations"""
     # Create js directory if needed
@@ -49,19 +202,28 @@ def copy_dependencies(tika_html_dir, viz_dir):
     css_dir = viz_dir / "css"
     css_dir.mkdir(exist_ok=True)
     
-    # Copy JS files from tika
+    # Copy JS files from tika; scandir avoids the per-entry Path
+    # construction and re-stat that glob pays
     tika_js_dir = tika_html_dir.parent / "js"
     if tika_js_dir.exists():
-        for js_file in tika_js_dir.glob("*.js"):
-            shutil.copy2(js_file, js_dir)
-        print(f"Copied JS files to {js_dir}")
-    
+        js_count = 0
+        with os.scandir(tika_js_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.js') and entry.is_file():
+                    _copy_if_newer(entry.path, js_dir / entry.name)
+                    js_count += 1
+        logger.info("Copied %d JS files to %s", js_count, js_dir)
+
     # Copy CSS files from tika
     tika_css_dir = tika_html_dir.parent / "css"
     if tika_css_dir.exists():
-        for css_file in tika_css_dir.glob("*.css"):
-            shutil.copy2(css_file, css_dir)
-        print(f"Copied CSS files to {css_dir}")
+        css_count = 0
+        with os.scandir(tika_css_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.css') and entry.is_file():
+                    _copy_if_newer(entry.path, css_dir / entry.name)
+                    css_count += 1
+        logger.info("Copied %d CSS files to %s", css_count, css_dir)
     
     # Create local d3.js if it doesn't exist
     d3_path = js_dir / "d3.v3.min.js"
@@ -72,7 +234,7 @@ def copy_dependencies(tika_html_dir, viz_dir):
 // Local proxy for D3 v3
 document.write('<script src="https://d3js.org/d3.v3.min.js"></script>');
 """)
-        print(f"Created D3.js proxy at {d3_path}")
+        logger.debug("Created D3.js proxy at %s", d3_path)
     
     # Create a helper script for debugging
     debug_js = js_dir / "debug-helper.js"
@@ -105,30 +267,18 @@ if (window.d3) {
     };
 }
 """)
-    print(f"Created debugging helper at {debug_js}")
+    logger.debug("Created debugging helper at %s", debug_js)
 
-def fix_html_references(viz_dir):
-    """Fix references in HTML files to use local resources"""
-    for html_file in viz_dir.glob("*.html"):
-        print(f"Fixing references in {html_file}")
-    
-        with open(html_file, "r", encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-    
-        # Replace CDN references with local ones
-        content = content.replace('http://d3js.org/d3.v3.min.js', 'js/d3.v3.min.js')
-    
-        # Add debugging script
-        debug_script = """
+# All three rewrites applied in one scan of each HTML file
+_HTML_REWRITE_RE = re.compile(rb'http://d3js\.org/d3\.v3\.min\.js|</head>|</body>')
+
+# Debugging script to inject
+_DEBUG_SCRIPT = b"""
 <script src="js/debug-helper.js"></script>
 """
-        if "<head>" in content:
-            content = content.replace("</head>", debug_script + "</head>")
-        else:
-            content = debug_script + content
-    
-        # Add basic error handling directly in the HTML
-        error_handler = """
+
+# Basic error handling injected directly in the HTML
+_ERROR_HANDLER = b"""
 <div id="error-display" style="display:none; color:red; border:1px solid red; padding:10px; margin:10px;">
   Error loading visualization. Check console for details.
 </div>
@@ -139,7 +289,7 @@ document.addEventListener('DOMContentLoaded', function() {
     var viz = document.querySelector('svg');
     if (!viz || viz.childElementCount === 0) {
       document.getElementById('error-display').style.display = 'block';
-      document.getElementById('error-display').innerHTML += 
+      document.getElementById('error-display').innerHTML +=
         '<p>Failed to render visualization. Possible reasons:</p>' +
         '<ul>' +
         '<li>JSON data format incorrect</li>' +
@@ -151,147 +301,181 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 </script>
 """
-        if "</body>" in content:
-            content = content.replace("</body>", error_handler + "</body>")
-        else:
-            content += error_handler
-    
-        with open(html_file, "w", encoding='utf-8') as f:
+
+_HTML_REPLACEMENTS = {
+    b'http://d3js.org/d3.v3.min.js': b'js/d3.v3.min.js',
+    b'</head>': _DEBUG_SCRIPT + b'</head>',
+    b'</body>': _ERROR_HANDLER + b'</body>',
+}
+
+def fix_html_references(viz_dir):
+    """Fix references in HTML files to use local resources"""
+    with os.scandir(viz_dir) as entries:
+        html_files = [entry.path for entry in entries
+                      if entry.name.endswith('.html') and entry.is_file()]
+
+    fixed = 0
+    for html_file in html_files:
+        # One r+b handle covers both the read and the rewrite, saving
+        # the second open/close; raw bytes skip the UTF-8 decode/encode
+        # round-trip since the substitutions are pure ASCII
+        with open(html_file, "r+b") as f:
+            head = f.read(4096)
+
+            # An already-rewritten file references the injected helper
+            # near the top; skip it instead of re-reading and doubling
+            # up the insertions
+            if b'js/debug-helper.js' in head:
+                logger.debug("References already fixed in %s, skipping", html_file)
+                continue
+
+            logger.debug("Fixing references in %s", html_file)
+            content = head + f.read()
+
+            # Apply the CDN swap and both insertions in a single pass
+            # over the content instead of three full replace scans
+            seen = set()
+
+            def _swap(match):
+                token = match.group(0)
+                seen.add(token)
+                return _HTML_REPLACEMENTS[token]
+
+            content = _HTML_REWRITE_RE.sub(_swap, content)
+
+            # Documents without head/body close tags still get the helpers
+            if b'</head>' not in seen:
+                content = _DEBUG_SCRIPT + content
+            if b'</body>' not in seen:
+                content += _ERROR_HANDLER
+
+            f.seek(0)
             f.write(content)
+            f.truncate()
+        fixed += 1
+
+    logger.info("Fixed references in %d of %d HTML files in %s",
+                fixed, len(html_files), viz_dir)
 
 def prepare_json_for_visualization(data, viz_type):
-    """Prepare JSON data for specific visualization types"""
-    enhanced_data = enhance_cluster_data(data)
-    
+    """Reshape already-enhanced cluster data for a visualization type.
+
+    The caller runs enhance_cluster_data once per file; this only does
+    the per-viz restructuring.
+    """
     if viz_type == "dynamic-circlepacking":
         # Dynamic cluster needs specific format
         formatted_data = {
             "name": "Root",
-            "children": enhanced_data.get("children", [])
+            "children": data.get("children", [])
         }
     elif viz_type == "cluster-d3":
         # Cluster-d3 needs a specific format with name and children properties
-        children = enhanced_data.get("children", [])
-        
-        # LIMIT THE NUMBER OF CLUSTERS - only take the first 50 clusters that have at least 2 items
-        limited_children = []
-        for cluster in children:
-            if "children" in cluster and len(cluster["children"]) >= 2:  # Only include clusters with at least 2 items
-                if "name" not in cluster:
-                    cluster["name"] = f"Cluster_{cluster.get('id', 'unknown')}"
-                
-                # Limit items in each cluster if there are too many
-                if len(cluster["children"]) > 10:
-                    cluster["children"] = cluster["children"][:10]  # Take only first 10 items
-                
-                # Ensure each item has a name
-                for item in cluster["children"]:
-                    if "name" not in item and "path" in item:
-                        item["name"] = os.path.basename(item["path"])
-                
-                limited_children.append(cluster)
-                
-                # Stop after we have 50 clusters
-                if len(limited_children) >= 50:
-                    break
-        
-        formatted_data = {
-            "name": "clusters",
-            "children": limited_children
-        }
+        formatted_data = format_cluster_d3(data.get("children", []))
     else:
         # Default format for circle packing
-        formatted_data = enhanced_data
-    
+        formatted_data = data
+
     return formatted_data
 
+def _process_sim_type(sim_type, viz_root, tika_html_dir, similarity_results):
+    """Build one similarity type's visualization directory.
+
+    Independent of the other types, so setup_visualization_directory can
+    run the three in parallel.
+    """
+    # Create directory for this similarity type
+    viz_dir = viz_root / sim_type
+    viz_dir.mkdir(exist_ok=True)
+
+    # Copy dependencies first
+    copy_dependencies(tika_html_dir, viz_dir)
+
+    # Copy HTML visualization files
+    html_files = ["circlepacking.html", "cluster-d3.html", "dynamic-circlepacking.html"]
+    for html_file in html_files:
+        src_file = tika_html_dir / html_file
+        if src_file.exists():
+            shutil.copy2(src_file, viz_dir / html_file)
+            logger.debug("Copied %s to %s", html_file, viz_dir)
+
+    # Fix HTML references
+    fix_html_references(viz_dir)
+
+    # Process the clusters JSON file
+    clusters_file = similarity_results / f"{sim_type}_similarity_clusters.json"
+    if clusters_file.exists():
+        try:
+            # cluster-d3 only needs the first 50 qualifying clusters;
+            # with ijson they stream straight from the file and the
+            # parser never touches the tail
+            d3_data = None
+            if ijson is not None:
+                d3_data = format_cluster_d3(iter_clusters(clusters_file))
+
+            data = load_json(clusters_file)
+
+            # Enhance once; the per-viz calls below only reshape
+            enhance_cluster_data(data)
+
+            if d3_data is None:
+                # Without ijson, build it from the loaded tree instead
+                d3_data = format_cluster_d3(data.get("children", []))
+
+            # Save specialized formats for different visualizations
+            write_json(prepare_json_for_visualization(data, "circlepacking"),
+                       viz_dir / "circle.json")
+
+            # Note: dynamic-circlepacking.html reads dynamic_circle.json
+            write_json(prepare_json_for_visualization(data, "dynamic-circlepacking"),
+                       viz_dir / "dynamic_circle.json")
+
+            # Create a backup copy with clear naming; this one is for
+            # people to inspect, so keep it indented
+            write_json(data, viz_dir / f"{sim_type}_data.json", indent=True)
+
+            write_json(d3_data, viz_dir / "clusters.json")
+            logger.info("Created circle, dynamic_circle, clusters and backup "
+                        "JSON files in %s", viz_dir)
+
+        except (json.JSONDecodeError, ValueError):
+            logger.error("Could not parse %s as valid JSON", clusters_file)
+        except Exception as e:
+            logger.error("Error processing %s: %s", clusters_file, e)
+    else:
+        logger.warning("%s does not exist", clusters_file)
+
+    return viz_dir
+
 def setup_visualization_directory():
     """Set up the visualization directory structure"""
     # Get project paths
     project_root = Path(__file__).parent.parent
     similarity_results = project_root / "similarity-results"
     tika_html_dir = project_root / "tika-similarity" / "html"
-    
+
     # Create visualization directories
     viz_root = project_root / "visualizations"
     viz_root.mkdir(exist_ok=True)
-    
-    # Dictionary to track visualization directories
-    viz_dirs = {}
-    
-    # Process each similarity type
-    for sim_type in ["cosine", "jaccard", "edit_value"]:
-        # Create directory for this similarity type
-        viz_dir = viz_root / sim_type
-        viz_dir.mkdir(exist_ok=True)
-        viz_dirs[sim_type] = viz_dir
-        
-        # Copy dependencies first
-        copy_dependencies(tika_html_dir, viz_dir)
-        
-        # Copy HTML visualization files
-        html_files = ["circlepacking.html", "cluster-d3.html", "dynamic-circlepacking.html"]
-        for html_file in html_files:
-            src_file = tika_html_dir / html_file
-            if src_file.exists():
-                shutil.copy2(src_file, viz_dir / html_file)
-                print(f"Copied {html_file} to {viz_dir}")
-    
-        # Fix HTML references
-        fix_html_references(viz_dir)
-    
-        # Process the clusters JSON file
-        clusters_file = similarity_results / f"{sim_type}_similarity_clusters.json"
-        if clusters_file.exists():
-            try:
-                with open(clusters_file, 'r') as f:
-                    data = json.load(f)
-            
-                # Save specialized formats for different visualizations
-                viz_types = ["circlepacking", "cluster-d3", "dynamic-circlepacking"]  # Updated to match HTML files
-                for viz_type in viz_types:
-                    formatted_data = prepare_json_for_visualization(data, viz_type)
-                
-                    # Determine output file name
-                    if viz_type == "circlepacking":
-                        output_file = viz_dir / "circle.json"
-                    elif viz_type == "cluster-d3":
-                        output_file = viz_dir / "clusters.json"
-                    elif viz_type == "dynamic-circlepacking":  # Changed from dynamic-cluster
-                        # Note: You need to check what file dynamic-circlepacking.html is looking for
-                        # It's likely circle.json or dynamic_circle.json
-                        output_file = viz_dir / "dynamic_circle.json"  # Adjust this based on what you find
-                    
-                    # Write the file
-                    with open(output_file, 'w') as f:
-                        json.dump(formatted_data, f, indent=2)
-                    print(f"Created JSON for {viz_type} in {output_file}")
-            
-                # Create a backup copy with clear naming
-                with open(viz_dir / f"{sim_type}_data.json", 'w') as f:
-                    json.dump(data, f, indent=2)
-            
-            except json.JSONDecodeError:
-                print(f"Error: Could not parse {clusters_file} as valid JSON")
-            except Exception as e:
-                print(f"Error processing {clusters_file}: {str(e)}")
-        else:
-            print(f"Warning: {clusters_file} does not exist")
+
+    # The three types share no mutable state and are I/O and JSON
+    # bound, so build their directories concurrently
+    sim_types = ["cosine", "jaccard", "edit_value"]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [
+            pool.submit(_process_sim_type, sim_type, viz_root,
+                        tika_html_dir, similarity_results)
+            for sim_type in sim_types
+        ]
+        viz_dirs = {sim_type: future.result()
+                    for sim_type, future in zip(sim_types, futures)}
 
     # Create the main index.html
     create_main_index(viz_root, viz_dirs)
 
     return viz_root
 
-def create_main_index(viz_root, viz_dirs):
-    """Create a main index.html to navigate between visualizations"""
-        
-    links_html = ""
-    for sim_type, viz_dir in viz_dirs.items():
-        type_name = sim_type.replace("_", " ").title()
-        rel_path = os.path.relpath(viz_dir, viz_root)
-        
-        links_html += f"""
+_VIZ_LINKS_TEMPLATE = """
         <div class="viz-type">
             <h2>{type_name}</h2>
             <ul>
@@ -303,8 +487,8 @@ def create_main_index(viz_root, viz_dirs):
             </ul>
         </div>
         """
-    
-    index_content = f"""<!DOCTYPE html>
+
+_INDEX_TEMPLATE = """<!DOCTYPE html>
 <html>
 <head>
     <title>Haunted Places Similarity Visualizations</title>
@@ -321,7 +505,7 @@ def create_main_index(viz_root, viz_dirs):
 </head>
 <body>
     <h1>Haunted Places Similarity Visualizations</h1>
-    
+
     <div class="description">
         <p>This page provides visualizations of similarity analyses for haunted places documents.</p>
         <p>Each visualization type shows different aspects of how the documents relate to each other.</p>
@@ -332,68 +516,115 @@ def create_main_index(viz_root, viz_dirs):
         </ul>
         <p><em>Note: If visualizations don't load correctly, try using a different browser or check the browser console for errors.</em></p>
     </div>
-    
+
     {links_html}
-    
+
     <div style="margin-top: 30px; text-align: center; color: #666; font-size: 0.9em;">
         <p>Generated using Tika Similarity Analysis</p>
     </div>
 </body>
 </html>
     """
-    
+
+def create_main_index(viz_root, viz_dirs):
+    """Create a main index.html to navigate between visualizations"""
+
+    links_html = ""
+    for sim_type, viz_dir in viz_dirs.items():
+        links_html += _VIZ_LINKS_TEMPLATE.format(
+            type_name=sim_type.replace("_", " ").title(),
+            rel_path=os.path.relpath(viz_dir, viz_root),
+            sim_type=sim_type,
+        )
+
     with open(viz_root / "index.html", 'w') as f:
-        f.write(index_content)
-    
-    print("Created main index.html navigation page")
+        f.write(_INDEX_TEMPLATE.format(links_html=links_html))
+
+    logger.info("Created main index.html navigation page")
+
+class _SendfileRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Request handler that serves file bodies with os.sendfile.
+
+    sendfile moves the bytes kernel-to-socket without the userspace
+    read/write loop shutil.copyfileobj would run, which matters for the
+    larger clusters.json payloads.
+    """
+
+    def copyfile(self, source, outputfile):
+        # Directory listings arrive as BytesIO without a real fd; those
+        # (and any sendfile-refusing source) use the stock copy loop
+        try:
+            in_fd = source.fileno()
+        except OSError:
+            return super().copyfile(source, outputfile)
+
+        out_fd = self.connection.fileno()
+        offset = 0
+        remaining = os.fstat(in_fd).st_size
+        try:
+            while remaining > 0:
+                sent = os.sendfile(out_fd, in_fd, offset, remaining)
+                if sent == 0:
+                    break
+                offset += sent
+                remaining -= sent
+        except OSError:
+            if offset:
+                raise
+            return super().copyfile(source, outputfile)
+
+def _bind_server(handler):
+    """Bind an HTTP server, preferring stable ports from 8000 upwards.
+
+    Scanning a fixed range gives re-runs the same URL (usually 8000
+    itself, since allow_reuse_address skips the TIME_WAIT penalty). If
+    the whole range is busy, fall back to a kernel-assigned free port
+    instead of giving up.
+    """
+    # ThreadingHTTPServer handles each request on its own thread, so one
+    # slow JSON download never blocks the page's other asset requests
+    # (it also sets allow_reuse_address, keeping re-runs on port 8000)
+    server_cls = http.server.ThreadingHTTPServer
+
+    for port in range(8000, 8100):
+        try:
+            return server_cls(("", port), handler)
+        except OSError:
+            continue
+
+    # Port 0 asks the kernel for any free ephemeral port
+    return server_cls(("", 0), handler)
 
 def start_visualization_server(directory):
     """Start an HTTP server for viewing the visualizations"""
     os.chdir(directory)
-    
-    # Try to find an available port starting from 8000
-    port = 8000
-    max_attempts = 10
-    
-    for attempt in range(max_attempts):
-        try:
-            # Try a range of ports to avoid conflicts
-            port = 8000 + random.randint(0, 1000)
-            handler = http.server.SimpleHTTPRequestHandler
-            httpd = socketserver.TCPServer(("", port), handler)
-            
-            print(f"\nStarting server at http://localhost:{port}")
-            print("Press Ctrl+C to stop the server")
-            
-            # Open the browser
-            webbrowser.open(f"http://localhost:{port}/index.html")
-            
-            # Start server
-            try:
-                httpd.serve_forever()
-            except KeyboardInterrupt:
-                print("\nServer stopped.")
-                break
-            finally:
-                httpd.shutdown()  # Ensure server shuts down
-                httpd.server_close()  # Close the socket
-            
-            break
-            
-        except OSError as e:
-            if e.errno == 48:  # Address already in use
-                print(f"Port {port} is already in use, trying another port...")
-                if attempt == max_attempts - 1:
-                    print("Could not find an available port after multiple attempts.")
-                    print("Please try again later or manually open the index.html file in your browser.")
-                    print(f"Visualization files are available at: {directory}")
-                    return
-            else:
-                print(f"Server error: {e}")
-                return
-        except Exception as e:
-            print(f"Server error: {e}")
-            return
+
+    handler = _SendfileRequestHandler
+    try:
+        httpd = _bind_server(handler)
+    except OSError as e:
+        print(f"Could not start server: {e}")
+        print("Please try again later or manually open the index.html file in your browser.")
+        print(f"Visualization files are available at: {directory}")
+        return
+
+    port = httpd.server_address[1]
+    print(f"\nStarting server at http://localhost:{port}")
+    print("Press Ctrl+C to stop the server")
+
+    # Open the browser
+    webbrowser.open(f"http://localhost:{port}/index.html")
+
+    # Start server
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    except Exception as e:
+        print(f"Server error: {e}")
+    finally:
+        httpd.shutdown()  # Ensure server shuts down
+        httpd.server_close()  # Close the socket
 
 def open_visualizations_without_server(directory):
     """Open the index.html file directly without starting a server"""